@@ -3,13 +3,14 @@ import asyncio
 import sys
 from pathlib import Path
 import uuid
+from prompt_toolkit import PromptSession
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.agents import get_agent
-from src.database import init_db
+from src.database import init_db, request_session
 
 
 async def main():
@@ -28,6 +29,13 @@ async def main():
     # Create a session ID for this conversation
     session_id = str(uuid.uuid4())
     
+    # Warm the categories cache and SQLite pages while the user types
+    # (keep a reference so the task is not garbage-collected)
+    warmup = asyncio.create_task(asyncio.to_thread(agent.get_all_categories))
+    
+    # Async prompt keeps the event loop free for background work while waiting for input
+    prompt_session = PromptSession()
+    
     print("✅ Agent ready!\n")
     
     print("Ask me about local events! Type 'exit' or 'quit' to end.\n")
@@ -40,7 +48,7 @@ async def main():
     while True:
         try:
             # Get user input
-            user_input = input("You: ").strip()
+            user_input = (await prompt_session.prompt_async("You: ")).strip()
             
             if not user_input:
                 continue
@@ -51,16 +59,20 @@ async def main():
             
             # Get agent response with session ID
             print("\n🤖 Agent: ", end="", flush=True)
-            response = await agent.chat(user_input, session_id=session_id)
+            with request_session():
+                response = await agent.chat(user_input, session_id=session_id)
             response_text = agent.print_response(response)
             print(response_text)
             print()
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\n\n👋 Goodbye!")
             break
         except Exception as e:
             print(f"\n❌ Error: {e}\n")
+    
+    # Don't leave the warmup running if the user quits before it finishes
+    warmup.cancel()
 
 
 if __name__ == "__main__":
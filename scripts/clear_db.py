@@ -7,8 +7,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.database.connection import get_db, init_db
+from src.database.connection import SessionLocal, init_db
 from src.database.models import Event
+from sqlalchemy import select
 
 
 def clear_database():
@@ -21,12 +22,11 @@ def clear_database():
         print("💡 Run the ETL script to create a new database.")
         return
     
-    # Get record count
-    db = next(get_db())
-    try:
-        record_count = db.query(Event).count()
+    # Check for any record without counting the whole table
+    with SessionLocal() as db:
+        has_records = db.execute(select(Event.id).limit(1)).first() is not None
         
-        if record_count == 0:
+        if not has_records:
             print("✅ Database is already empty.")
             return
         
@@ -38,13 +38,12 @@ def clear_database():
         print("⚠️  WARNING: This will permanently delete all records from the database!")
         print(f"📂 Database location: {db_path}")
         print(f"📊 Database size: {db_size_kb:.2f} KB")
-        print(f"📝 Number of records: {record_count}")
         
         response = input("\n❓ Are you sure you want to clear all records? (yes/no): ")
         
         if response.lower() in ['yes', 'y']:
             try:
-                db.query(Event).delete()
+                record_count = db.execute(Event.__table__.delete()).rowcount
                 db.commit()
                 print("\n✅ All records cleared successfully!")
                 print(f"🗑️  Deleted {record_count} record(s)")
@@ -54,8 +53,6 @@ def clear_database():
                 print(f"\n❌ Error clearing records: {e}")
         else:
             print("\n❌ Operation cancelled.")
-    finally:
-        db.close()
 
 
 def force_clear_database():
@@ -66,19 +63,16 @@ def force_clear_database():
         print("❌ Database file not found.")
         return False
     
-    db = next(get_db())
-    try:
-        record_count = db.query(Event).count()
-        db.query(Event).delete()
-        db.commit()
-        print(f"✅ Cleared {record_count} record(s) successfully!")
-        return True
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Error clearing records: {e}")
-        return False
-    finally:
-        db.close()
+    with SessionLocal() as db:
+        try:
+            record_count = db.execute(Event.__table__.delete()).rowcount
+            db.commit()
+            print(f"✅ Cleared {record_count} record(s) successfully!")
+            return True
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Error clearing records: {e}")
+            return False
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 """CLI script to run the ETL pipeline."""
 import asyncio
 import argparse
+import logging
+from src.database import init_db
 from src.etl import run_etl
 
 
@@ -11,30 +13,44 @@ if __name__ == "__main__":
     parser.add_argument(
         "--location",
         type=str,
-        default="portugal--lisbon",
-        help="Location slug (e.g., 'portugal--lisbon', 'united-states--san-francisco')"
+        nargs="+",
+        default=["portugal--lisbon"],
+        help="One or more location slugs (e.g., 'portugal--lisbon', 'united-states--san-francisco')"
     )
     parser.add_argument(
         "--max-results",
         type=int,
         default=50,
-        help="Maximum number of events to fetch (default: 50)"
+        help="Maximum number of events to fetch per location (default: 50)"
     )
     parser.add_argument(
         "--no-descriptions",
         action="store_true",
         help="Skip fetching event descriptions (faster but less detailed)"
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every event skipped or queued for storage"
+    )
     
     args = parser.parse_args()
     
+    # The scraper reports progress through logging; per-event lines are DEBUG.
+    # Other libraries (httpx, asyncio) stay at WARNING to keep the output readable
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("src.etl").setLevel(logging.DEBUG if args.verbose else logging.INFO)
+    
     # Invert the flag: --no-descriptions means fetch_descriptions=False
     fetch_descriptions = not args.no_descriptions
     
-    print(f"🚀 Starting ETL pipeline for {args.location}...")
+    print(f"🚀 Starting ETL pipeline for {', '.join(args.location)}...")
     print(f"📊 Max results: {args.max_results}")
     print(f"📝 Fetch descriptions: {'Yes' if fetch_descriptions else 'No (faster)'}")
     
+    # Create tables and apply schema updates before storing events
+    init_db()
+    
     asyncio.run(run_etl(
         location=args.location,
         max_results=args.max_results,
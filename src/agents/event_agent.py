@@ -1,38 +1,45 @@
 """Agno agent for event recommendations."""
 import os
-import asyncio
-from datetime import datetime
-from typing import List, Optional, Dict
+import threading
+import time
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional, Dict, Tuple, Union
 from pathlib import Path
 from dotenv import load_dotenv
 from agno.agent import Agent
 from agno.agent.agent import RunOutput
+from agno.run.agent import RunContentEvent
 from agno.db.sqlite import SqliteDb
-from sqlalchemy import or_, and_
-from src.database import get_db, Event
+from sqlalchemy import or_, and_, bindparam, lambda_stmt, select
+from sqlalchemy.engine import Row
+from src.database import Event, events_version, session_scope
 from src.etl.event_scraper import run_etl
 
 # Load environment variables
 load_dotenv()
 
+# Cached get_all_categories result as (events version, expiry time, text);
+# the TTL bounds staleness from writes made by other processes (e.g. scripts)
+CATEGORIES_CACHE_TTL = 300  # seconds
+_categories_cache: Optional[Tuple[int, float, str]] = None
+
+# Keyword match used by search_events; the pattern is bound once as :query
+KEYWORD_FILTER = or_(
+    Event.title.ilike(bindparam("query")),
+    Event.description.ilike(bindparam("query")),
+    Event.address.ilike(bindparam("query"))
+)
+
 
 class EventAgent:
     """Agent for recommending local events using Agno."""
     
     def __init__(self):
         """Initialize the event recommendation agent."""
-        # Set up SQLite database for agent conversation history
+        # SQLite database for agent conversation history, opened on first chat
         project_root = Path(__file__).parent.parent.parent
-        agent_db_path = project_root / "data" / "agent_sessions.db"
-        
-        # Create data directory if it doesn't exist
-        agent_db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Initialize Agno's SQLite database for conversation storage
-        agent_db = SqliteDb(
-            db_file=str(agent_db_path),
-            session_table="agent_sessions"
-        )
+        self.agent_db_path = project_root / "data" / "agent_sessions.db"
+        self._db_lock = threading.Lock()
         
         self.agent = Agent(
             name="Event Recommendation Agent",
@@ -60,8 +67,8 @@ class EventAgent:
                 self.fetch_events_for_city
             ],
             markdown=True,
-            # Assign database for conversation persistence
-            db=agent_db,
+            # Database for conversation persistence is attached by _ensure_db()
+            db=None,
             # Enable conversation history
             add_history_to_context=True,
             num_history_messages=10,  # Include last 10 messages in context
@@ -90,43 +97,42 @@ class EventAgent:
         Returns:
             Formatted string with event details
         """
-        db = next(get_db())
         try:
-            # Build query
-            events_query = db.query(Event)
-            
-            # Apply filters
-            if query:
-                search_filter = or_(
-                    Event.title.ilike(f"%{query}%"),
-                    Event.description.ilike(f"%{query}%"),
-                    Event.address.ilike(f"%{query}%")
-                )
-                events_query = events_query.filter(search_filter)
-            
-            if category:
-                events_query = events_query.filter(Event.category.ilike(f"%{category}%"))
-            
-            if location:
-                events_query = events_query.filter(Event.location.ilike(f"%{location}%"))
-            
-            # Execute query
-            events = events_query.limit(limit).all()
-            
-            if not events:
-                return "No events found matching your criteria. Try adjusting your search parameters."
-            
-            # Format results
-            result = f"Found {len(events)} event(s):\n\n"
-            for i, event in enumerate(events, 1):
-                result += self._format_event(event, i)
-            
-            return result
-            
+            with session_scope() as db:
+                # Build a cached statement over the listing columns only;
+                # each optional filter is its own cached lambda step and
+                # every value is supplied as a named bind parameter
+                stmt = lambda_stmt(lambda: select(*Event.summary_columns))
+                params = {"limit": limit}
+                
+                # Apply filters
+                if query:
+                    params["query"] = f"%{query}%"
+                    stmt += lambda s: s.where(KEYWORD_FILTER)
+                
+                if category:
+                    params["category"] = f"%{category}%"
+                    stmt += lambda s: s.where(Event.category.ilike(bindparam("category")))
+                
+                if location:
+                    params["location"] = f"%{location}%"
+                    stmt += lambda s: s.where(Event.location.ilike(bindparam("location")))
+                
+                # Execute query
+                stmt += lambda s: s.limit(bindparam("limit"))
+                events = db.execute(stmt, params).all()
+                
+                if not events:
+                    return "No events found matching your criteria. Try adjusting your search parameters."
+                
+                # Format results
+                parts = [f"Found {len(events)} event(s):\n\n"]
+                parts.extend(self._format_event(event, i) for i, event in enumerate(events, 1))
+                
+                return "".join(parts)
+                
         except Exception as e:
             return f"Error searching events: {str(e)}"
-        finally:
-            db.close()
     
     def search_events_by_title(self, title: str) -> str:
         """
@@ -139,33 +145,34 @@ class EventAgent:
         Returns:
             Formatted string with matching events including their IDs
         """
-        db = next(get_db())
         try:
-            events = db.query(Event).filter(
-                Event.title.ilike(f"%{title}%")
-            ).limit(5).all()
-            
-            if not events:
-                return f"No events found with title containing '{title}'."
-            
-            result = f"Found {len(events)} event(s) matching '{title}':\n\n"
-            for event in events:
-                result += f"Event ID {event.id}: {event.title}\n"
-                if event.date:
-                    result += f"   Date: {event.date}"
-                    if event.time:
-                        result += f" at {event.time}"
-                    result += "\n"
-                if event.address:
-                    result += f"   Address: {event.address}\n"
-                result += "\n"
-            
-            return result
-            
+            with session_scope() as db:
+                title_pattern = f"%{title}%"
+                events = db.execute(lambda_stmt(
+                    lambda: select(*Event.summary_columns).where(
+                        Event.title.ilike(title_pattern)
+                    ).limit(5)
+                )).all()
+                
+                if not events:
+                    return f"No events found with title containing '{title}'."
+                
+                parts = [f"Found {len(events)} event(s) matching '{title}':\n\n"]
+                for event in events:
+                    parts.append(f"Event ID {event.id}: {event.title}\n")
+                    if event.date:
+                        parts.append(f"   Date: {event.date}")
+                        if event.time:
+                            parts.append(f" at {event.time}")
+                        parts.append("\n")
+                    if event.address:
+                        parts.append(f"   Address: {event.address}\n")
+                    parts.append("\n")
+                
+                return "".join(parts)
+                
         except Exception as e:
             return f"Error searching events by title: {str(e)}"
-        finally:
-            db.close()
     
     def get_event_by_id(self, event_id: int) -> str:
         """
@@ -177,19 +184,19 @@ class EventAgent:
         Returns:
             Formatted string with event details
         """
-        db = next(get_db())
         try:
-            event = db.query(Event).filter(Event.id == event_id).first()
-            
-            if not event:
-                return f"Event with ID {event_id} not found."
-            
-            return self._format_event(event, detailed=True)
-            
+            with session_scope() as db:
+                event = db.execute(lambda_stmt(
+                    lambda: select(Event).where(Event.id == event_id)
+                )).scalars().first()
+                
+                if not event:
+                    return f"Event with ID {event_id} not found."
+                
+                return self._format_event(event, detailed=True)
+                
         except Exception as e:
             return f"Error retrieving event: {str(e)}"
-        finally:
-            db.close()
     
     def get_all_categories(self) -> str:
         """
@@ -198,26 +205,36 @@ class EventAgent:
         Returns:
             Formatted string with all categories
         """
-        db = next(get_db())
+        global _categories_cache
+        
+        # Categories only change when events are written, so reuse the last
+        # result until the ETL bumps the version or the TTL runs out
+        version = events_version()
+        if _categories_cache is not None:
+            cached_version, expires_at, cached_result = _categories_cache
+            if cached_version == version and time.monotonic() < expires_at:
+                return cached_result
+        
         try:
-            categories = db.query(Event.category).distinct().filter(
-                Event.category.isnot(None)
-            ).all()
-            
-            if not categories:
-                return "No categories available."
-            
-            category_list = [cat[0] for cat in categories if cat[0]]
-            result = f"Available categories ({len(category_list)}):\n"
-            for cat in sorted(category_list):
-                result += f"- {cat}\n"
-            
-            return result
-            
+            with session_scope() as db:
+                # Let SQLite de-duplicate and sort the categories
+                categories = db.query(Event.category).distinct().filter(
+                    Event.category.isnot(None)
+                ).order_by(Event.category).all()
+                
+                if not categories:
+                    result = "No categories available."
+                else:
+                    category_list = [cat[0] for cat in categories if cat[0]]
+                    parts = [f"Available categories ({len(category_list)}):\n"]
+                    parts.extend(f"- {cat}\n" for cat in category_list)
+                    result = "".join(parts)
+                
+                _categories_cache = (version, time.monotonic() + CATEGORIES_CACHE_TTL, result)
+                return result
+                
         except Exception as e:
             return f"Error retrieving categories: {str(e)}"
-        finally:
-            db.close()
     
     def get_upcoming_events(self, limit: int = 10) -> str:
         """
@@ -229,25 +246,26 @@ class EventAgent:
         Returns:
             Formatted string with upcoming events
         """
-        db = next(get_db())
         try:
-            events = db.query(Event).filter(
-                Event.date.isnot(None)
-            ).order_by(Event.date).limit(limit).all()
-            
-            if not events:
-                return "No upcoming events found."
-            
-            result = f"Upcoming {len(events)} event(s):\n\n"
-            for i, event in enumerate(events, 1):
-                result += self._format_event(event, i)
-            
-            return result
-            
+            with session_scope() as db:
+                # Walk the starts_at index from the start of today
+                start_of_today = datetime.combine(date.today(), datetime.min.time())
+                events = db.execute(lambda_stmt(
+                    lambda: select(*Event.summary_columns).where(
+                        Event.starts_at >= start_of_today
+                    ).order_by(Event.starts_at).limit(limit)
+                )).all()
+                
+                if not events:
+                    return "No upcoming events found."
+                
+                parts = [f"Upcoming {len(events)} event(s):\n\n"]
+                parts.extend(self._format_event(event, i) for i, event in enumerate(events, 1))
+                
+                return "".join(parts)
+                
         except Exception as e:
             return f"Error retrieving upcoming events: {str(e)}"
-        finally:
-            db.close()
     
     def get_events_by_location(self, location: str, limit: int = 10) -> str:
         """
@@ -260,27 +278,27 @@ class EventAgent:
         Returns:
             Formatted string with events in the location
         """
-        db = next(get_db())
         try:
-            events = db.query(Event).filter(
-                Event.location.ilike(f"%{location}%")
-            ).limit(limit).all()
-            
-            if not events:
-                return f"No events found in '{location}'."
-            
-            result = f"Events in {location} ({len(events)}):\n\n"
-            for i, event in enumerate(events, 1):
-                result += self._format_event(event, i)
-            
-            return result
-            
+            with session_scope() as db:
+                location_pattern = f"%{location}%"
+                events = db.execute(lambda_stmt(
+                    lambda: select(*Event.summary_columns).where(
+                        Event.location.ilike(location_pattern)
+                    ).limit(limit)
+                )).all()
+                
+                if not events:
+                    return f"No events found in '{location}'."
+                
+                parts = [f"Events in {location} ({len(events)}):\n\n"]
+                parts.extend(self._format_event(event, i) for i, event in enumerate(events, 1))
+                
+                return "".join(parts)
+                
         except Exception as e:
             return f"Error retrieving events by location: {str(e)}"
-        finally:
-            db.close()
     
-    def fetch_events_for_city(self, location: str, max_results: int = 30) -> str:
+    async def fetch_events_for_city(self, location: str, max_results: int = 30) -> str:
         """
         Fetch new events from Eventbrite for a specific city/location.
         Use this when no events are found in the database for a location.
@@ -294,24 +312,8 @@ class EventAgent:
             Formatted string with the result of the ETL process
         """
         try:
-            # Run ETL synchronously (the agent's tool call is synchronous)
-            # We need to create an event loop or run in the existing one
-            loop = None
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If loop is running, we need to schedule the coroutine
-                    # This happens when called from an async context
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as pool:
-                        count = pool.submit(
-                            lambda: asyncio.run(run_etl(location=location, max_results=max_results, fetch_descriptions=False))
-                        ).result()
-                else:
-                    count = loop.run_until_complete(run_etl(location=location, max_results=max_results, fetch_descriptions=False))
-            except RuntimeError:
-                # No event loop, create one
-                count = asyncio.run(run_etl(location=location, max_results=max_results, fetch_descriptions=False))
+            # The agent runs tools inside its event loop, so the ETL can be awaited directly
+            count = await run_etl(location=location, max_results=max_results, fetch_descriptions=False)
             
             if count > 0:
                 return f"✅ Successfully fetched and stored {count} new events for '{location}'! You can now search for events in this location."
@@ -321,12 +323,12 @@ class EventAgent:
         except Exception as e:
             return f"❌ Error fetching events: {str(e)}. Please check that the location format is correct (e.g., 'portugal--lisbon')."
     
-    def _format_event(self, event: Event, index: Optional[int] = None, detailed: bool = False) -> str:
+    def _format_event(self, event: Union[Event, Row], index: Optional[int] = None, detailed: bool = False) -> str:
         """
         Format an event for display.
         
         Args:
-            event: Event object to format
+            event: Event object, or a row of Event.summary_columns for listings
             index: Optional index number for the event
             detailed: Whether to include detailed information
             
@@ -336,28 +338,28 @@ class EventAgent:
         prefix = f"{index}. " if index else ""
         
         # Include event ID in a comment for the agent to see
-        result = f"{prefix}**{event.title}** (ID: {event.id})\n"
+        parts = [f"{prefix}**{event.title}** (ID: {event.id})\n"]
         
         if event.date:
-            result += f"   📅 Date: {event.date}"
+            parts.append(f"   📅 Date: {event.date}")
             if event.time:
-                result += f" at {event.time}"
-            result += "\n"
+                parts.append(f" at {event.time}")
+            parts.append("\n")
         
         if event.address:
-            result += f"   📍 Address: {event.address}\n"
+            parts.append(f"   📍 Address: {event.address}\n")
         
         if detailed and event.description:
-            result += f"   📝 Description: {event.description}\n"
+            parts.append(f"   📝 Description: {event.description}\n")
         
         if event.category:
-            result += f"   🏷️  Category: {event.category}\n"
+            parts.append(f"   🏷️  Category: {event.category}\n")
         
         if event.url:
-            result += f"   🔗 More info: {event.url}\n"
+            parts.append(f"   🔗 More info: {event.url}\n")
         
-        result += "\n"
-        return result
+        parts.append("\n")
+        return "".join(parts)
     
     async def chat(self, message: str, session_id: Optional[str] = None) -> RunOutput:
         """
@@ -370,6 +372,8 @@ class EventAgent:
         Returns:
             Agent response
         """
+        self._ensure_db()
+        
         if session_id:
             # Use session to maintain conversation history
             return await self.agent.arun(message, session_id=session_id)
@@ -377,6 +381,38 @@ class EventAgent:
             # No session - single message interaction
             return await self.agent.arun(message)
     
+    async def chat_stream(self, message: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Send a message to the agent and yield the response text as it is generated.
+        
+        Args:
+            message: User message
+            session_id: Optional session ID to maintain conversation history
+            
+        Yields:
+            Chunks of the agent's response text
+        """
+        self._ensure_db()
+        
+        async for event in self.agent.arun(message, session_id=session_id, stream=True):
+            if isinstance(event, RunContentEvent) and event.content:
+                yield event.content
+    
+    def _ensure_db(self):
+        """Attach Agno's SQLite conversation storage the first time it is needed."""
+        if self.agent.db is not None:
+            return
+        
+        with self._db_lock:
+            if self.agent.db is None:
+                # Create data directory if it doesn't exist
+                self.agent_db_path.parent.mkdir(parents=True, exist_ok=True)
+                
+                self.agent.db = SqliteDb(
+                    db_file=str(self.agent_db_path),
+                    session_table="agent_sessions"
+                )
+    
     def print_response(self, response: RunOutput) -> str:
         """
         Extract and return the agent's response text.
@@ -394,11 +430,15 @@ class EventAgent:
 
 # Singleton instance
 _agent_instance = None
+_agent_lock = threading.Lock()
 
 
 def get_agent() -> EventAgent:
     """Get or create the singleton agent instance."""
     global _agent_instance
-    if (_agent_instance is None):
-        _agent_instance = EventAgent()
+    if _agent_instance is None:
+        # Double-checked so concurrent first requests build only one agent
+        with _agent_lock:
+            if _agent_instance is None:
+                _agent_instance = EventAgent()
     return _agent_instance
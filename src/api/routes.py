@@ -1,16 +1,24 @@
 """API routes for the application."""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from collections import OrderedDict
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
+import json
 import uuid
 
-from src.database import get_db, Event
-from src.etl import run_etl
+from src.database import get_db, request_session, Event
+from src.etl import EventbriteScraper
 from src.agents import get_agent
 
 router = APIRouter()
 
+# Number of background ETL runs whose status is kept for lookup
+ETL_JOBS_KEPT = 100
+
 
 # Pydantic models for requests/responses
 class ETLRequest(BaseModel):
@@ -22,11 +30,16 @@ class ETLRequest(BaseModel):
 
 class ETLResponse(BaseModel):
     """Response model for ETL endpoint."""
-    status: str
+    job_id: str
+    status: str  # accepted, running, completed or failed
     message: str
     events_stored: Optional[int] = None
 
 
+# Recent background ETL runs by job ID, oldest first
+_etl_jobs: "OrderedDict[str, ETLResponse]" = OrderedDict()
+
+
 class EventResponse(BaseModel):
     """Response model for event data."""
     id: int
@@ -36,6 +49,7 @@ class EventResponse(BaseModel):
     address: Optional[str]
     date: Optional[str]
     time: Optional[str]
+    starts_at: Optional[datetime]
     url: Optional[str]
     source: str
     category: Optional[str]
@@ -56,6 +70,25 @@ class ChatResponse(BaseModel):
     session_id: Optional[str] = None
 
 
+def _resolve_session_id(session_id: Optional[str]) -> str:
+    """
+    Validate the client's session ID, generating a new one if needed.
+    
+    Args:
+        session_id: Session ID sent by the client
+        
+    Returns:
+        Session ID to use for the conversation
+    """
+    # Reject placeholder values and generate a new one if needed
+    if not session_id or session_id in ["string", "null", "undefined", ""]:
+        session_id = str(uuid.uuid4())
+        print(f"🔄 Generated new session ID: {session_id}")
+    else:
+        print(f"♻️  Using existing session ID: {session_id}")
+    return session_id
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_agent(request: ChatRequest):
     """
@@ -69,18 +102,12 @@ async def chat_with_agent(request: ChatRequest):
     """
     try:
         agent = get_agent()
-        
-        # Validate and handle session ID
-        # Reject placeholder values and generate a new one if needed
-        session_id = request.session_id
-        if not session_id or session_id in ["string", "null", "undefined", ""]:
-            session_id = str(uuid.uuid4())
-            print(f"🔄 Generated new session ID: {session_id}")
-        else:
-            print(f"♻️  Using existing session ID: {session_id}")
+        session_id = _resolve_session_id(request.session_id)
         
         # Pass session ID to maintain conversation history
-        response = await agent.chat(request.message, session_id=session_id)
+        # All tool calls in this turn share a single database session
+        with request_session():
+            response = await agent.chat(request.message, session_id=session_id)
         
         # Extract response text
         response_text = agent.print_response(response)
@@ -94,60 +121,153 @@ async def chat_with_agent(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
 
-@router.post("/etl/run", response_model=ETLResponse)
-async def trigger_etl(request: ETLRequest = ETLRequest()):
+@router.post("/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest):
     """
-    Manually trigger the ETL pipeline to fetch events from Eventbrite.
+    Chat with the event recommendation agent, streaming the reply as Server-Sent Events.
+    
+    Each `data:` message carries a JSON object with the next `content` chunk.
+    The stream ends with a `done` event, or an `error` event if the run fails.
+    The session ID is returned in the `X-Session-ID` header.
     
     Args:
-        request: ETL request with location, max_results, and fetch_descriptions
+        request: Chat request with user message
         
     Returns:
-        ETL response with status and number of events stored
+        Streaming response with the agent's reply
+    """
+    agent = get_agent()
+    session_id = _resolve_session_id(request.session_id)
+    
+    async def event_stream():
+        try:
+            # All tool calls in this turn share a single database session
+            with request_session():
+                async for chunk in agent.chat_stream(request.message, session_id=session_id):
+                    yield f"data: {json.dumps({'content': chunk})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'session_id': session_id})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Chat error: {str(e)}'})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"X-Session-ID": session_id}
+    )
+
+
+async def _run_etl_job(job: ETLResponse, request: ETLRequest):
+    """
+    Run the ETL pipeline for a queued job and record its outcome.
+    
+    Args:
+        job: Status entry of the job, updated in place
+        request: ETL request with location, max_results, and fetch_descriptions
     """
+    job.status = "running"
     try:
-        events_stored = await run_etl(
+        # The scraper is called directly because run_etl reports failures as 0 stored
+        count = await EventbriteScraper().scrape_and_store(
             location=request.location,
             max_results=request.max_results,
             fetch_descriptions=request.fetch_descriptions
         )
+        job.status = "completed"
+        job.events_stored = count
+        job.message = f"Stored {count} new events for {request.location}"
+    except Exception as e:
+        job.status = "failed"
+        job.message = f"ETL failed: {str(e)}"
+
+
+@router.post("/etl/run", response_model=ETLResponse, status_code=202)
+async def trigger_etl(background_tasks: BackgroundTasks, request: ETLRequest = ETLRequest()):
+    """
+    Manually trigger the ETL pipeline to fetch events from Eventbrite.
+    
+    The pipeline runs as a background task after the response is sent,
+    so the client doesn't hold the connection open while pages are scraped.
+    Its progress and result are available from /etl/jobs/{job_id}.
+    
+    Args:
+        background_tasks: FastAPI background task queue
+        request: ETL request with location, max_results, and fetch_descriptions
         
-        return ETLResponse(
-            status="success",
-            message=f"ETL completed successfully for {request.location}",
-            events_stored=events_stored
-        )
+    Returns:
+        ETL response with the ID of the queued job
+    """
+    job = ETLResponse(
+        job_id=str(uuid.uuid4()),
+        status="accepted",
+        message=f"ETL started in the background for {request.location}"
+    )
     
-    except ValueError as e:
-        return ETLResponse(
-            status="error",
-            message=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"ETL failed: {str(e)}")
+    # Keep only the most recent jobs so the registry doesn't grow without bound
+    _etl_jobs[job.job_id] = job
+    while len(_etl_jobs) > ETL_JOBS_KEPT:
+        _etl_jobs.popitem(last=False)
+    
+    background_tasks.add_task(_run_etl_job, job, request)
+    
+    return job
+
+
+@router.get("/etl/jobs/{job_id}", response_model=ETLResponse)
+async def get_etl_job(job_id: str):
+    """
+    Get the status of a background ETL run.
+    
+    Args:
+        job_id: Job ID returned by /etl/run
+        
+    Returns:
+        Job status, with the number of events stored once completed
+        
+    Raises:
+        HTTPException: If the job is unknown or no longer kept
+    """
+    job = _etl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="ETL job not found")
+    return job
 
 
 @router.get("/events", response_model=List[EventResponse])
-async def get_events(
+def get_events(
     db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     category: Optional[str] = None,
-    location: Optional[str] = None
+    location: Optional[str] = None,
+    after_starts_at: Optional[datetime] = None,
+    after_id: Optional[int] = None
 ):
     """
     Get list of events from the database.
     
+    Events are ordered by start time and ID (latest first), with events whose
+    start time is unknown last. To fetch the next page, pass the `starts_at` and
+    `id` of the last event received as `after_starts_at` and `after_id`, so each
+    page is an index seek rather than an OFFSET scan.
+    
     Args:
         db: Database session
-        skip: Number of events to skip (for pagination)
         limit: Maximum number of events to return
         category: Filter by category
         location: Filter by location (partial match)
+        after_starts_at: Start time of the last event from the previous page
+        after_id: ID of the last event from the previous page
         
     Returns:
         List of events
+        
+    Raises:
+        HTTPException: If after_starts_at is given without after_id
     """
+    # after_id alone is a valid cursor (events without a start time), but
+    # after_starts_at alone would silently restart from the first page
+    if after_starts_at is not None and after_id is None:
+        raise HTTPException(status_code=422, detail="after_starts_at requires after_id")
+    
     query = db.query(Event)
     
     if category:
@@ -156,12 +276,31 @@ async def get_events(
     if location:
         query = query.filter(Event.location.ilike(f"%{location}%"))
     
-    events = query.order_by(Event.date.desc()).offset(skip).limit(limit).all()
+    events = []
+    
+    # Events with a start time first, as a pure row-value seek on its index. OR-ing the
+    # unscheduled events into the same filter would make SQLite scan the index from the top
+    if after_id is None or after_starts_at is not None:
+        scheduled = query.filter(Event.starts_at.isnot(None))
+        if after_starts_at is not None:
+            scheduled = scheduled.filter(
+                tuple_(Event.starts_at, Event.id) < (after_starts_at, after_id)
+            )
+        events = scheduled.order_by(Event.starts_at.desc(), Event.id.desc()).limit(limit).all()
+    
+    # Events without a start time sort last, so they only fill a page left short
+    if len(events) < limit:
+        unscheduled = query.filter(Event.starts_at.is_(None))
+        if after_id is not None and after_starts_at is None:
+            # The cursor is already inside the unscheduled tail of the listing
+            unscheduled = unscheduled.filter(Event.id < after_id)
+        events += unscheduled.order_by(Event.id.desc()).limit(limit - len(events)).all()
+    
     return events
 
 
 @router.get("/events/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(event_id: int, db: Session = Depends(get_db)):
     """
     Get a specific event by ID.
     
@@ -181,7 +320,7 @@ async def get_event(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/events/stats/summary")
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """
     Get summary statistics about events in the database.
     
@@ -193,20 +332,13 @@ async def get_stats(db: Session = Depends(get_db)):
     """
     total_events = db.query(Event).count()
     
-    # Get category breakdown
-    categories = db.query(Event.category).distinct().all()
-    category_counts = {}
-    for (cat,) in categories:
-        if cat:
-            count = db.query(Event).filter(Event.category == cat).count()
-            category_counts[cat] = count
-    
-    # Get source breakdown
-    sources = db.query(Event.source).distinct().all()
-    source_counts = {}
-    for (source,) in sources:
-        count = db.query(Event).filter(Event.source == source).count()
-        source_counts[source] = count
+    # Get category breakdown in a single GROUP BY
+    category_rows = db.query(Event.category, func.count(Event.id)).group_by(Event.category).all()
+    category_counts = {cat: count for cat, count in category_rows if cat}
+    
+    # Get source breakdown in a single GROUP BY
+    source_rows = db.query(Event.source, func.count(Event.id)).group_by(Event.source).all()
+    source_counts = dict(source_rows)
     
     return {
         "total_events": total_events,
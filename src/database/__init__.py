@@ -1,5 +1,11 @@
 """Database package initialization."""
-from src.database.connection import get_db, init_db, close_db
+from src.database.connection import (
+    SessionLocal, get_db, init_db, close_db, request_session, session_scope,
+    events_version, mark_events_changed
+)
 from src.database.models import Event
 
-__all__ = ["get_db", "init_db", "close_db", "Event"]
+__all__ = [
+    "SessionLocal", "get_db", "init_db", "close_db", "request_session", "session_scope",
+    "events_version", "mark_events_changed", "Event"
+]
@@ -1,39 +1,211 @@
 """Database connection and session management."""
 import os
-from sqlalchemy import create_engine
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+from sqlalchemy import bindparam, create_engine, event, inspect, select
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 # Database file path
 DATABASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
 os.makedirs(DATABASE_DIR, exist_ok=True)
 DATABASE_URL = f"sqlite:///{os.path.join(DATABASE_DIR, 'events.db')}"
 
+# Bump whenever tables or indexes change so init_db brings existing databases up to date
+SCHEMA_VERSION = 6
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={"check_same_thread": False},  # Needed for SQLite
+    pool_size=10,
+    max_overflow=20,
+    query_cache_size=1200  # Room for the agent tools' cached lambda statements
 )
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune SQLite for concurrent reads and fewer fsyncs on every new connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, avoids most fsyncs
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
 
+# Session shared by every agent tool call within a single request/chat turn, with the lock
+# serialising its use: the agent runs parallel tool calls in separate worker threads
+_request_db: ContextVar[Optional[Tuple[Session, threading.Lock]]] = ContextVar("request_db", default=None)
+
+# Bumped whenever this process writes events, so cached lookups know to refresh
+_events_version = 0
+
 
 def get_db():
-    """Dependency to get database session."""
+    """FastAPI dependency to get database session; use SessionLocal() directly elsewhere."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def request_session() -> Iterator[Session]:
+    """Open one session for the current request and share it with nested tool calls."""
     db = SessionLocal()
+    token = _request_db.set((db, threading.Lock()))
     try:
         yield db
     finally:
         db.close()
+        _request_db.reset(token)
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Reuse the request-scoped session, or open a short-lived one outside a request."""
+    shared = _request_db.get()
+    if shared is not None:
+        db, lock = shared
+        # Sessions aren't thread-safe, so tool calls take turns; ending the transaction
+        # after each one returns the connection to the pool while the LLM is working
+        with lock:
+            try:
+                yield db
+            finally:
+                db.rollback()
+        return
+    
+    with SessionLocal() as db:
+        yield db
+
+
+def events_version() -> int:
+    """Return the current version of the events table for this process."""
+    return _events_version
+
+
+def mark_events_changed():
+    """Invalidate cached event lookups after events have been written."""
+    global _events_version
+    _events_version += 1
+
+
+def _add_missing_columns(conn):
+    """Add nullable columns declared on the models but missing from existing tables."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+
+
+def _backfill_start_times(conn):
+    """Parse the start time of events stored without one."""
+    # Imported here because the ETL package imports this module
+    from src.etl.event_scraper import parse_start_time
+    
+    events = Base.metadata.tables["events"]
+    rows = conn.execute(
+        select(events.c.id, events.c.date, events.c.time, events.c.created_at).where(
+            events.c.starts_at.is_(None),
+            events.c.date.isnot(None)
+        )
+    ).all()
+    
+    updates = []
+    for row in rows:
+        starts_at = parse_start_time(row.date, row.time, row.created_at)
+        if starts_at:
+            updates.append({"event_id": row.id, "starts_at": starts_at})
+    
+    # Bulk UPDATE by primary key in a single executemany
+    if updates:
+        conn.execute(
+            events.update().where(events.c.id == bindparam("event_id")).values(
+                starts_at=bindparam("starts_at")
+            ),
+            updates
+        )
+
+
+def _rebuild_events(conn):
+    """Recreate the events table from its model, keeping every row."""
+    events = Base.metadata.tables["events"]
+    
+    # Index names are global in SQLite, so drop the old ones before the new table claims them
+    for index in conn.exec_driver_sql("PRAGMA index_list(events)").all():
+        if index.origin == "c":
+            conn.exec_driver_sql(f"DROP INDEX {index.name}")
+    
+    conn.exec_driver_sql("ALTER TABLE events RENAME TO events_old")
+    events.create(conn)
+    columns = ", ".join(column.name for column in events.columns)
+    conn.exec_driver_sql(f"INSERT INTO events ({columns}) SELECT {columns} FROM events_old")
+    conn.exec_driver_sql("DROP TABLE events_old")
+
+
+def _migrate(conn, version: int):
+    """Bring data and indexes of a database at an older schema version up to date."""
+    if version < 3:
+        # events.url became unique: keep the first row per URL and drop the old
+        # non-unique index so it is recreated as unique
+        conn.exec_driver_sql(
+            "DELETE FROM events WHERE url IS NOT NULL AND id NOT IN "
+            "(SELECT MIN(id) FROM events WHERE url IS NOT NULL GROUP BY url)"
+        )
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_events_url")
+    if version < 4:
+        # Location filters are leading-wildcard ILIKE matches, which can't use an index
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_events_location")
+    if version < 5:
+        # starts_at (added in version 2) is NULL for events stored before it; resolve their
+        # date text against the scrape time, the same way the ETL does for new events
+        _backfill_start_times(conn)
+    if version < 6:
+        # events.category became COLLATE NOCASE, which SQLite can only change by rebuilding
+        # the table; databases created from the current models already have it
+        table_sql = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events'"
+        ).scalar()
+        if "NOCASE" not in table_sql:
+            _rebuild_events(conn)
 
 
 def init_db():
     """Initialize the database by creating all tables."""
+    # Warm starts only read the schema version from the file header
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    if version >= SCHEMA_VERSION:
+        return
+    
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips existing tables, so add any columns and indexes declared after they were created
+    with engine.begin() as conn:
+        _add_missing_columns(conn)
+        _migrate(conn, version)
+    
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def close_db():
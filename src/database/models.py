@@ -14,11 +14,12 @@ class Event(Base):
     description = Column(Text, nullable=True)
     location = Column(String(255), nullable=True)
     address = Column(String(255), nullable=True)
-    date = Column(String(50), nullable=True)  # Store as string for flexibility
+    date = Column(String(50), nullable=True, index=True)  # Store as string for flexibility
     time = Column(String(50), nullable=True)
-    url = Column(String(500), nullable=True)
+    starts_at = Column(DateTime, nullable=True, index=True)  # Parsed from date/time for ordering
+    url = Column(String(500), nullable=True, unique=True, index=True)
     source = Column(String(100), nullable=False)  # Which API/website it came from
-    category = Column(String(100), nullable=True)  # Event category (music, sports, etc.)
+    category = Column(String(100, collation="NOCASE"), nullable=True, index=True)  # Event category (music, sports, etc.)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     
     def __repr__(self):
@@ -26,16 +27,26 @@ class Event(Base):
     
     def to_dict(self):
         """Convert event to dictionary."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "location": self.location,
-            "address": self.address,
-            "date": self.date,
-            "time": self.time,
-            "url": self.url,
-            "source": self.source,
-            "category": self.category,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        data = {field: getattr(self, field) for field in self.dict_fields}
+        for field in self.datetime_fields:
+            value = data[field]
+            data[field] = value.isoformat() if value else None
+        return data
+
+
+# Columns rendered in event listings - everything except the long description text
+Event.summary_columns = (
+    Event.id,
+    Event.title,
+    Event.date,
+    Event.time,
+    Event.address,
+    Event.category,
+    Event.url
+)
+
+# Fields of to_dict, in column order, and the ones rendered as ISO 8601 strings
+Event.dict_fields = tuple(column.key for column in Event.__table__.columns)
+Event.datetime_fields = tuple(
+    column.key for column in Event.__table__.columns if isinstance(column.type, DateTime)
+)
@@ -1,4 +1,4 @@
 """ETL package initialization."""
-from src.etl.event_scraper import EventbriteScraper, run_etl
+from src.etl.event_scraper import EventbriteScraper, parse_start_time, run_etl
 
-__all__ = ["EventbriteScraper", "run_etl"]
+__all__ = ["EventbriteScraper", "parse_start_time", "run_etl"]
@@ -1,11 +1,118 @@
 """ETL pipeline for scraping events from Eventbrite website."""
+import asyncio
+import json
+import logging
+import re
 import httpx
-from datetime import datetime
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from src.database.models import Event
-from src.database.connection import get_db
+from src.database.connection import SessionLocal, mark_events_changed
+
+logger = logging.getLogger(__name__)
+
+
+# Time of day at the start of Eventbrite's time text, e.g. "7:30 PM  GMT+1" or "11 AM + 3 more"
+_TIME_OF_DAY_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(AM|PM)', re.IGNORECASE)
+# Card date line, e.g. "Fri, Nov 28 •  11:00 PM"; the time may carry a suffix such as "GMT+1"
+_DATETIME_RE = re.compile(r'([^•]+)•([^•]*(?:AM|PM)[^•]*)')
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Card paragraphs carry hashed class names such as "Typography_root__487rx", so match on the prefix
+_TYPOGRAPHY_SELECTOR = 'p[class*="Typography_root"]'
+_CLAMP = 'clamp-line'  # Class marking the venue paragraph
+_HEADING_TAGS = ('h2', 'h3', 'h4')
+# Every card node _parse_event_card reads, matched in one pass
+_CARD_FIELDS_SELECTOR = f'a.event-card-link, {", ".join(_HEADING_TAGS)}, {_TYPOGRAPHY_SELECTOR}'
+
+# schema.org data Eventbrite embeds in listing pages
+_JSON_LD_SELECTOR = 'script[type="application/ld+json"]'
+
+# Event pages fetched at once when filling in descriptions
+_DESCRIPTION_CONCURRENCY = 10
+
+# Last listing fetched per URL as (ETag, Last-Modified, max_results, events) for conditional GETs
+_listing_cache: Dict[str, Tuple[Optional[str], Optional[str], int, List[dict]]] = {}
+
+
+def parse_start_time(date_str: Optional[str], time_str: Optional[str], reference: datetime) -> Optional[datetime]:
+    """
+    Resolve Eventbrite's display date and time into a datetime.
+    
+    Eventbrite shows dates relative to when the page was scraped ("Today",
+    "Tomorrow", "Saturday") or without a year ("Fri, Nov 28"), so they are
+    resolved against the scrape time.
+    
+    Args:
+        date_str: Date text from the event card
+        time_str: Time text from the event card
+        reference: When the event was scraped, in UTC like created_at
+        
+    Returns:
+        Event start as a naive datetime, or None if the date can't be parsed
+    """
+    if not date_str:
+        return None
+    
+    text = date_str.strip().lower()
+    today = reference.date()
+    
+    if text == "today":
+        day = today
+    elif text == "tomorrow":
+        day = today + timedelta(days=1)
+    elif text in _WEEKDAYS:
+        # "Today" is used for the current day, so a weekday name is always ahead
+        days_ahead = (_WEEKDAYS.index(text) - today.weekday()) % 7 or 7
+        day = today + timedelta(days=days_ahead)
+    else:
+        # "Fri, Nov 28" - the weekday prefix is redundant once month and day are known
+        month_day = text.split(",")[-1].strip()
+        try:
+            parsed = datetime.strptime(f"{month_day} {today.year}", "%b %d %Y").date()
+        except ValueError:
+            return None
+        # Dates earlier than the scrape belong to the following year
+        if parsed < today:
+            parsed = parsed.replace(year=today.year + 1)
+        day = parsed
+    
+    hour, minute = 0, 0
+    match = _TIME_OF_DAY_RE.search(time_str or "")
+    if match:
+        hour = int(match.group(1)) % 12 + (12 if match.group(3).upper() == "PM" else 0)
+        minute = int(match.group(2) or 0)
+    
+    return datetime(day.year, day.month, day.day, hour, minute)
+
+
+def _parse_html(response: httpx.Response) -> LexborHTMLParser:
+    """
+    Parse an HTML response without decoding it to str first when possible.
+    
+    Args:
+        response: HTTP response with an HTML body
+        
+    Returns:
+        Parsed document
+    """
+    # Lexbor reads bytes as UTF-8, so only other charsets need httpx's decoded text
+    charset = (response.charset_encoding or "utf-8").lower().replace("_", "-")
+    if charset in ("utf-8", "utf8"):
+        return LexborHTMLParser(response.content)
+    return LexborHTMLParser(response.text)
+
+
+def _clip_description(description: str) -> str:
+    """Limit description length to avoid storing too much data."""
+    if len(description) > 1000:
+        return description[:1000] + "..."
+    return description
 
 
 class EventbriteScraper:
@@ -15,13 +122,30 @@ class EventbriteScraper:
         """Initialize the scraper."""
         self.base_url = "https://www.eventbrite.com"
         self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+            "Accept-Encoding": "gzip, br"
         }
     
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client shared by the listing and event page requests.
+        
+        Returns:
+            HTTP/2 client with pooled connections and compressed responses
+        """
+        return httpx.AsyncClient(
+            http2=True,  # Multiplexes concurrent description fetches over one connection
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            headers=self.headers,
+            timeout=30.0
+        )
+    
     async def search_events(
         self,
         location: str = "portugal--lisbon",
-        max_results: int = 50
+        max_results: int = 50,
+        client: Optional[httpx.AsyncClient] = None
     ) -> List[dict]:
         """
         Scrape events from Eventbrite website.
@@ -29,44 +153,85 @@ class EventbriteScraper:
         Args:
             location: Location slug (e.g., "portugal--lisbon", "united-states--san-francisco")
             max_results: Maximum number of events to fetch
+            client: HTTP client to reuse; a new one is created if not given
             
         Returns:
             List of event dictionaries
         """
+        if client is None:
+            async with self._create_client() as client:
+                return await self.search_events(location, max_results, client)
+        
         events = []
+        url = f"{self.base_url}/d/{location}/events/"
+        
+        # Ask the server to skip the body if the listing hasn't changed since the last
+        # fetch, as long as that fetch parsed at least as many cards as are wanted now
+        headers = {}
+        cached = _listing_cache.get(url)
+        if cached and cached[2] >= max_results:
+            etag, last_modified = cached[0], cached[1]
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
         
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            url = f"{self.base_url}/d/{location}/events/"
+        try:
+            logger.info("📄 Fetching events from %s...", location)
+            logger.debug("🔗 URL: %s", url)
+            response = await client.get(url, headers=headers)
             
-            try:
-                print(f"📄 Fetching events from {location}...")
-                print(f"🔗 URL: {url}")
-                response = await client.get(
-                    url,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                
-                # Parse HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find event cards by class
-                event_cards = soup.find_all('div', class_='event-card')
-                
-                if not event_cards:
-                    print(f"⚠️  No event cards found")
-                    return []
-                
-                print(f"✅ Found {len(event_cards)} event cards")
+            if response.status_code == 304 and headers:
+                logger.info("✅ Listing unchanged since last fetch")
+                # Copies, since callers fill in location and description on the dicts
+                return [dict(event) for event in cached[3][:max_results]]
+            
+            response.raise_for_status()
+            
+            # Parse HTML
+            tree = _parse_html(response)
+            
+            # Structured event data, keyed by URL without the query string
+            structured = self._parse_json_ld(tree)
+            
+            # Find event cards by class
+            event_cards = tree.css('div.event-card')
+            
+            if event_cards:
+                logger.info("✅ Found %d event cards", len(event_cards))
                 
-                for card in event_cards[:max_results]:
+                for card in event_cards:
+                    # Stop as soon as enough cards parsed, rather than slicing up front,
+                    # so cards that fail to parse don't cost results
+                    if len(events) >= max_results:
+                        break
+                    
                     event_data = self._parse_event_card(card)
                     if event_data:
+                        # The structured data carries the description, saving a page fetch
+                        item = structured.get(event_data["url"].split("?")[0])
+                        if item and item.get("description"):
+                            event_data["description"] = _clip_description(item["description"])
                         events.append(event_data)
+            elif structured:
+                # Card markup changed; fall back to the structured data alone
+                logger.info("✅ Found %d structured events", len(structured))
                 
-            except httpx.HTTPError as e:
-                print(f"❌ Error fetching events: {e}")
+                for item in list(structured.values())[:max_results]:
+                    event_data = self._parse_json_ld_event(item)
+                    if event_data:
+                        events.append(event_data)
+            else:
+                logger.warning("⚠️  No event cards found")
+                return []
+            
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if etag or last_modified:
+                _listing_cache[url] = (etag, last_modified, max_results, [dict(event) for event in events])
+            
+        except httpx.HTTPError as e:
+            logger.error("❌ Error fetching events: %s", e)
         
         return events
     
@@ -75,64 +240,73 @@ class EventbriteScraper:
         Parse event data from HTML card.
         
         Args:
-            card: BeautifulSoup element containing event data
+            card: Parsed HTML node containing event data
             
         Returns:
             Parsed event dictionary or None
         """
         try:
-            # Extract title from the link
-            title_link = card.find('a', class_='event-card-link')
+            # The card holds the title link, a heading with the title, and p tags
+            # with the date/time and venue. The p tag structure is consistent:
+            # 1st p tag with bold styling and bullet (•) = date/time
+            # 2nd p tag with clamp-line class = venue
+            # 3rd p tag = price info
+            
+            title_link = None
+            title_elem = None
+            date_str = None
+            time_str = None
+            venue = None
+            
+            # A single selector pass returns the link, headings and text paragraphs in
+            # document order, instead of one subtree scan per field
+            for node in card.css(_CARD_FIELDS_SELECTOR):
+                tag = node.tag
+                
+                if tag == 'a':
+                    if title_link is None:
+                        title_link = node
+                
+                # The title is usually in a h3 within the card
+                elif tag in _HEADING_TAGS:
+                    if title_elem is None:
+                        title_elem = node
+                
+                # Paragraphs after the venue (price info) are not needed
+                elif venue is None:
+                    text = node.text(strip=True)
+                    
+                    # Check if this is the date/time element (date • time with AM/PM)
+                    match = _DATETIME_RE.fullmatch(text)
+                    if match:
+                        date_str = match.group(1).strip()
+                        time_str = match.group(2).strip()
+                    
+                    # Check if this is the venue element (has clamp-line class); attributes
+                    # builds a new dict on each access, so only read it when needed
+                    elif _CLAMP in (node.attributes.get('class') or ''):
+                        venue = text
+            
+            # Cards without the title link or a title are skipped
             if not title_link:
                 return None
             
+            title = title_elem.text(strip=True) if title_elem else None
+            if not title:
+                return None
+            
             # Get URL
-            url = title_link.get('href', '')
+            attributes = title_link.attributes
+            url = attributes.get('href') or ''
             if url and not url.startswith('http'):
                 url = f"{self.base_url}{url}" if url.startswith('/') else url
             
             # Extract category from data-event-category attribute on the link
-            category = title_link.get('data-event-category', None)
+            category = attributes.get('data-event-category')
             if category:
                 # Capitalize first letter of each word for consistency
                 category = category.title()
             
-            # Extract title - it's usually in a h3 within the card
-            title_elem = card.find(['h2', 'h3', 'h4'])
-            title = title_elem.get_text(strip=True) if title_elem else None
-            
-            if not title:
-                return None
-            
-            # Extract date/time and venue from p tags
-            # The structure is consistent:
-            # 1st p tag with bold styling and bullet (•) = date/time
-            # 2nd p tag with clamp-line class = venue
-            # 3rd p tag = price info
-            
-            date_str = None
-            time_str = None
-            venue = None
-            
-            p_tags = card.find_all('p', class_=lambda x: x and 'Typography_root' in str(x))
-            
-            for p in p_tags:
-                text = p.get_text(strip=True)
-                classes = p.get('class', [])
-                
-                # Check if this is the date/time element (has • and AM/PM)
-                if '•' in text and ('AM' in text or 'PM' in text):
-                    # Parse date and time from format like "Fri, Nov 28 •  11:00 PM"
-                    parts = text.split('•')
-                    if len(parts) == 2:
-                        date_str = parts[0].strip()
-                        time_str = parts[1].strip()
-                
-                # Check if this is the venue element (has clamp-line class)
-                elif any('clamp-line' in str(c) for c in classes):
-                    venue = text
-                    break  # Found venue, we can stop
-            
             return {
                 "title": title,
                 "description": None,
@@ -140,15 +314,97 @@ class EventbriteScraper:
                 "address": venue,
                 "date": date_str,
                 "time": time_str,
+                # Resolved against UTC, the clock created_at is stored in, so the
+                # start time backfill of older events lands on the same day
+                "starts_at": parse_start_time(date_str, time_str, datetime.now(timezone.utc)),
                 "url": url,
                 "source": "Eventbrite",
                 "category": category
             }
         
         except Exception as e:
-            print(f"⚠️  Error parsing event card: {e}")
+            logger.warning("⚠️  Error parsing event card: %s", e)
             return None
     
+    def _parse_json_ld(self, tree: LexborHTMLParser) -> Dict[str, dict]:
+        """
+        Collect the schema.org events embedded as JSON-LD in a page.
+        
+        Args:
+            tree: Parsed listing page
+            
+        Returns:
+            Event objects keyed by their URL without the query string
+        """
+        events = {}
+        
+        for script in tree.css(_JSON_LD_SELECTOR):
+            try:
+                data = json.loads(script.text())
+            except ValueError:
+                continue
+            
+            # Listings wrap events in an ItemList of ListItems
+            items = deque(data if isinstance(data, list) else [data])
+            while items:
+                item = items.popleft()
+                if not isinstance(item, dict):
+                    continue
+                if item.get("@type") == "ItemList":
+                    items.extend(item.get("itemListElement") or [])
+                elif item.get("@type") == "ListItem":
+                    items.append(item.get("item"))
+                elif str(item.get("@type", "")).endswith("Event") and item.get("url"):
+                    events[item["url"].split("?")[0]] = item
+        
+        return events
+    
+    def _parse_json_ld_event(self, item: dict) -> Optional[dict]:
+        """
+        Build an event dictionary from a schema.org Event object.
+        
+        Args:
+            item: JSON-LD Event object
+            
+        Returns:
+            Parsed event dictionary or None
+        """
+        title = item.get("name")
+        if not title:
+            return None
+        
+        # startDate is ISO 8601, with a time of day only when the event has one
+        date_str = None
+        time_str = None
+        starts_at = None
+        start = item.get("startDate")
+        if start:
+            try:
+                starts_at = datetime.fromisoformat(start.replace("Z", "+00:00")).replace(tzinfo=None)
+            except ValueError:
+                pass
+        if starts_at:
+            # Same display format as the event cards, e.g. "Fri, Nov 28" and "11:00 PM"
+            date_str = f"{starts_at:%a, %b} {starts_at.day}"
+            if "T" in start:
+                time_str = f"{starts_at.hour % 12 or 12}:{starts_at:%M %p}"
+        
+        venue = item.get("location")
+        description = item.get("description")
+        
+        return {
+            "title": title,
+            "description": _clip_description(description) if description else None,
+            "location": None,  # Will be set by the calling method
+            "address": venue.get("name") if isinstance(venue, dict) else None,
+            "date": date_str,
+            "time": time_str,
+            "starts_at": starts_at,
+            "url": item.get("url"),
+            "source": "Eventbrite",
+            "category": None  # Only the card markup carries the category
+        }
+    
     async def _fetch_event_description(self, event_url: str, client: httpx.AsyncClient) -> Optional[str]:
         """
         Fetch event description from individual event page.
@@ -161,43 +417,35 @@ class EventbriteScraper:
             Event description text or None
         """
         try:
-            response = await client.get(
-                event_url,
-                headers=self.headers,
-                timeout=30.0
-            )
+            response = await client.get(event_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            tree = _parse_html(response)
             
             # Try to find description by id first
-            desc_elem = soup.find(id='event-description')
+            desc_elem = tree.css_first('#event-description')
             
             # If not found by id, try by class
             if not desc_elem:
-                desc_elem = soup.find('div', class_='event-description')
+                desc_elem = tree.css_first('div.event-description')
             
             # Try summary class as fallback
             if not desc_elem:
-                desc_elem = soup.find('div', class_='summary')
+                desc_elem = tree.css_first('div.summary')
             
             if desc_elem:
                 # Get text and clean it up
-                description = desc_elem.get_text(strip=True)
-                # Limit description length to avoid storing too much data
-                if len(description) > 1000:
-                    description = description[:1000] + "..."
-                return description
+                return _clip_description(desc_elem.text(strip=True))
             
             return None
             
         except Exception as e:
-            print(f"⚠️  Error fetching description: {e}")
+            logger.warning("⚠️  Error fetching description: %s", e)
             return None
     
     async def scrape_and_store(
         self,
-        location: str = "portugal--lisbon",
+        location: Union[str, List[str]] = "portugal--lisbon",
         max_results: int = 50,
         fetch_descriptions: bool = True
     ) -> int:
@@ -205,93 +453,141 @@ class EventbriteScraper:
         Scrape events from Eventbrite and store them in the database.
         
         Args:
-            location: Location slug (e.g., "portugal--lisbon")
-            max_results: Maximum number of events to fetch
+            location: Location slug (e.g., "portugal--lisbon"), or a list of slugs
+            max_results: Maximum number of events to fetch per location
             fetch_descriptions: Whether to fetch event descriptions from individual pages
             
         Returns:
             Number of events stored
         """
-        print(f"🔍 Searching for events in {location}...")
-        
-        # Fetch events from Eventbrite
-        events = await self.search_events(location, max_results)
-        
-        if not events:
-            print("❌ No events found")
-            return 0
-        
-        print(f"✅ Found {len(events)} events")
+        locations = [location] if isinstance(location, str) else list(location)
+        logger.info("🔍 Searching for events in %s...", ", ".join(locations))
         
         # Parse and store events
-        db = next(get_db())
         stored_count = 0
         seen_urls = set()  # Track URLs in this batch to prevent duplicates
+        new_events = []  # Rows to insert in a single statement
         
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            try:
-                for event_data in events:
-                    # Skip events without title
-                    if not event_data.get("title"):
-                        continue
-                    
-                    # Set the location slug
-                    event_data["location"] = location
+        # One client (and connection pool) for the listings and every event page
+        async with self._create_client() as client:
+            # Fetch the listing of every location from Eventbrite concurrently
+            listings = await asyncio.gather(
+                *(self.search_events(slug, max_results, client) for slug in locations)
+            )
+            
+            events = []
+            for slug, listing in zip(locations, listings):
+                # Set the location slug
+                for event_data in listing:
+                    event_data["location"] = slug
+                events.extend(listing)
+            
+            if not events:
+                logger.warning("❌ No events found")
+                return 0
+            
+            logger.info("✅ Found %d events", len(events))
+            
+            with SessionLocal() as db:
+                try:
+                    # Look up already stored events for the whole batch in one query each
+                    # (by URL, or by title for events without one). The unique url index
+                    # already makes the insert skip stored URLs, so they are only looked up
+                    # to avoid fetching description pages for them
+                    urls = [e["url"] for e in events if e.get("url")] if fetch_descriptions else []
+                    titles = [e["title"] for e in events if not e.get("url") and e.get("title")]
+                    # Short read transaction, so no snapshot is held open while pages download
+                    with db.begin():
+                        existing_urls = set(db.scalars(
+                            select(Event.url).where(Event.url.in_(urls))
+                        )) if urls else set()
+                        existing_titles = set(db.scalars(
+                            select(Event.title).where(
+                                Event.title.in_(titles),
+                                Event.source == "Eventbrite"
+                            )
+                        )) if titles else set()
                     
-                    # Skip if we've already seen this URL in this batch
-                    event_url = event_data.get("url")
-                    if event_url:
-                        if event_url in seen_urls:
-                            print(f"⏭️  Skipping duplicate in batch: {event_data['title']}")
+                    for event_data in events:
+                        # Skip events without title
+                        if not event_data.get("title"):
                             continue
-                        seen_urls.add(event_url)
+                        
+                        # Skip if we've already seen this URL in this batch
+                        event_url = event_data.get("url")
+                        if event_url:
+                            if event_url in seen_urls:
+                                logger.debug("⏭️  Skipping duplicate in batch: %s", event_data["title"])
+                                continue
+                            seen_urls.add(event_url)
+                        
+                        # Check if event already exists in database (by URL, or title if no URL)
+                        if event_url:
+                            existing_event = event_url in existing_urls
+                        else:
+                            existing_event = event_data["title"] in existing_titles
+                        
+                        if existing_event:
+                            logger.debug("⏭️  Skipping duplicate in DB: %s", event_data["title"])
+                            continue
+                        
+                        new_events.append(event_data)
+                        logger.debug("📥 Queued: %s", event_data["title"])
                     
-                    # Check if event already exists in database (by URL or title)
-                    if event_url:
-                        existing_event = db.query(Event).filter(
-                            Event.url == event_url
-                        ).first()
-                    else:
-                        # Fallback to title check if no URL
-                        existing_event = db.query(Event).filter(
-                            Event.title == event_data["title"],
-                            Event.source == "Eventbrite"
-                        ).first()
+                    # Fetch descriptions concurrently, a bounded number of pages at a time
+                    to_describe = [
+                        e for e in new_events if e.get("url") and not e.get("description")
+                    ] if fetch_descriptions else []
+                    if to_describe:
+                        semaphore = asyncio.Semaphore(_DESCRIPTION_CONCURRENCY)
+                        
+                        async def fetch_description(event_url: str) -> Optional[str]:
+                            async with semaphore:
+                                return await self._fetch_event_description(event_url, client)
+                        
+                        descriptions = await asyncio.gather(
+                            *(fetch_description(e["url"]) for e in to_describe),
+                            return_exceptions=True
+                        )
+                        for event_data, description in zip(to_describe, descriptions):
+                            if not isinstance(description, BaseException):
+                                event_data["description"] = description
                     
-                    if existing_event:
-                        print(f"⏭️  Skipping duplicate in DB: {event_data['title']}")
-                        continue
+                    # One prepared INSERT run with executemany over all rows; the unique
+                    # index on url makes SQLite skip any event stored meanwhile. The
+                    # transaction commits on exit and rolls back if the insert fails
+                    if new_events:
+                        stmt = sqlite_insert(Event.__table__).on_conflict_do_nothing(
+                            index_elements=["url"]
+                        )
+                        with db.begin():
+                            stored_count = db.execute(stmt, new_events).rowcount
                     
-                    # Fetch description if enabled
-                    if fetch_descriptions and event_url:
-                        event_data["description"] = await self._fetch_event_description(event_url, client)
+                    if stored_count:
+                        mark_events_changed()
+                    logger.info("🎉 Successfully stored %d new events!", stored_count)
                     
-                    # Create new event
-                    new_event = Event(**event_data)
-                    db.add(new_event)
-                    stored_count += 1
-                    print(f"✅ Stored: {event_data['title']}")
-                
-                db.commit()
-                print(f"\n🎉 Successfully stored {stored_count} new events!")
-                
-            except Exception as e:
-                db.rollback()
-                print(f"❌ Error storing events: {e}")
-                raise
-            finally:
-                db.close()
+                except Exception as e:
+                    logger.error("❌ Error storing events: %s", e)
+                    raise
         
         return stored_count
 
 
-async def run_etl(location: str = "portugal--lisbon", max_results: int = 50, fetch_descriptions: bool = True) -> int:
+async def run_etl(
+    location: Union[str, List[str]] = "portugal--lisbon",
+    max_results: int = 50,
+    fetch_descriptions: bool = True
+) -> int:
     """
     Run the ETL pipeline to fetch and store events.
     
+    Several locations are scraped in one run, with their listing pages fetched
+    concurrently and all new events stored in a single insert.
+    
     Args:
-        location: Location slug to search for events
-        max_results: Maximum number of events to fetch
+        location: Location slug to search for events, or a list of slugs
+        max_results: Maximum number of events to fetch per location
         fetch_descriptions: Whether to fetch event descriptions (slower but more complete)
         
     Returns:
@@ -306,12 +602,11 @@ async def run_etl(location: str = "portugal--lisbon", max_results: int = 50, fet
         )
         return count
     except Exception as e:
-        print(f"❌ Error running ETL: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error running ETL: %s", e)
         return 0
 
 
 if __name__ == "__main__":
-    import asyncio
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
     asyncio.run(run_etl())
@@ -49,8 +49,10 @@ async def root():
             "docs": "/docs",
             "health": "/health",
             "chat": "/api/chat",
+            "chat_stream": "/api/chat/stream",
             "events": "/api/events",
             "etl": "/api/etl/run",
+            "etl_job": "/api/etl/jobs/{job_id}",
             "stats": "/api/events/stats/summary"
         }
     }
@@ -0,0 +1,83 @@
+"""Tests for keyset pagination of GET /events."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import get_events
+from src.database import Event
+from src.database.connection import Base
+
+
+@pytest.fixture
+def db():
+    """In-memory database with scheduled and unscheduled events, some sharing a start time."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    
+    session = sessionmaker(bind=engine)()
+    session.execute(Event.__table__.insert(), [
+        {
+            "title": f"Event {i}",
+            "starts_at": None if i % 10 == 0 else datetime(2026, 1, 1) + timedelta(hours=i % 37),
+            "source": "Eventbrite"
+        }
+        for i in range(1, 2001)
+    ])
+    session.commit()
+    
+    yield session
+    
+    session.close()
+    engine.dispose()
+
+
+def fetch_page(db, after_starts_at=None, after_id=None, limit=50):
+    """Call the route handler directly with explicit query parameters."""
+    return get_events(
+        db=db,
+        limit=limit,
+        category=None,
+        location=None,
+        after_starts_at=after_starts_at,
+        after_id=after_id
+    )
+
+
+def test_cursor_walks_every_event_once_in_order(db):
+    expected = db.query(Event).order_by(Event.starts_at.desc(), Event.id.desc()).all()
+    
+    seen = []
+    page = fetch_page(db)
+    while page:
+        seen.extend(page)
+        last = page[-1]
+        page = fetch_page(db, after_starts_at=last.starts_at, after_id=last.id)
+    
+    assert [e.id for e in seen] == [e.id for e in expected]
+
+
+def test_start_time_cursor_is_an_index_seek(db):
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        fetch_page(db, after_starts_at=datetime(2026, 1, 1, 20), after_id=1000)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    
+    seek_sql, seek_params = next(s for s in statements if "(events.starts_at, events.id) <" in s[0])
+    plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {seek_sql}", seek_params).all()
+    details = " ".join(row[-1] for row in plan)
+    
+    assert "SEARCH" in details and "ix_events_starts_at" in details
+    assert "SCAN" not in details